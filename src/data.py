@@ -6,13 +6,27 @@ traduzione italiana e una breve spiegazione.  Le regole grammaticali sono
 organizzate in temi con spiegazioni e domande.
 """
 
+import re
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from typing import Dict, Any, Tuple
 
+# Riferimenti alle fonti inclusi nelle spiegazioni (es. 【59630982256329†L128-L184】):
+# utili nei dati, ma non vengono mostrati al giocatore.
+_CITATION_RE = re.compile(r"【[^】]*】")
 
-@dataclass
+
+def _strip_citations(text: str) -> str:
+    return _CITATION_RE.sub("", text)
+
+
+@dataclass(frozen=True)
 class VocabularyItem:
     """Rappresenta un singolo vocabolo tedesco con articolo e plurale."""
+    __slots__ = (
+        "level", "singular", "article", "plural", "translation", "explanation",
+        "display_explanation",
+    )
+
     level: int
     singular: str
     article: str
@@ -20,27 +34,41 @@ class VocabularyItem:
     translation: str
     explanation: str
 
+    def __post_init__(self) -> None:
+        # Spiegazione senza riferimenti alle fonti, calcolata una sola volta
+        object.__setattr__(self, "display_explanation", _strip_citations(self.explanation))
+
 
-@dataclass
+@dataclass(frozen=True)
 class GrammarQuestion:
     """Domanda relativa a un argomento grammaticale."""
+    __slots__ = ("prompt", "options", "answer", "explanation", "display_explanation")
+
     prompt: str
-    options: List[str]
+    options: Tuple[str, ...]
     answer: str
     explanation: str
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "display_explanation", _strip_citations(self.explanation))
+
 
-@dataclass
+@dataclass(frozen=True)
 class GrammarTopic:
     """Argomento grammaticale con spiegazione generale e domande."""
+    __slots__ = ("level", "name", "explanation", "questions", "display_explanation")
+
     level: int
     name: str
     explanation: str
-    questions: List[GrammarQuestion]
+    questions: Tuple[GrammarQuestion, ...]
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "display_explanation", _strip_citations(self.explanation))
 
 
 # Elenco dei vocaboli introdotti nei livelli del gioco
-VOCABULARY: List[VocabularyItem] = [
+VOCABULARY: Tuple[VocabularyItem, ...] = (
     VocabularyItem(
         level=1,
         singular="Gabelstapler",
@@ -142,13 +170,14 @@ VOCABULARY: List[VocabularyItem] = [
             "diventa die Verpackungen【725387443235402†L128-L134】."
         ),
     ),
-]
+)
 
-# Argomenti grammaticali introdotti nei vari livelli
-GRAMMAR_TOPICS: List[GrammarTopic] = []
+# Livello più alto che introduce nuovi vocaboli
+MAX_LEVEL: int = max(item.level for item in VOCABULARY)
 
-# Livello 2 – Articoli indeterminativi
-GRAMMAR_TOPICS.append(
+# Argomenti grammaticali introdotti nei vari livelli
+GRAMMAR_TOPICS: Tuple[GrammarTopic, ...] = (
+    # Livello 2 – Articoli indeterminativi
     GrammarTopic(
         level=2,
         name="Articoli indeterminativi",
@@ -158,37 +187,34 @@ GRAMMAR_TOPICS.append(
             "Non esiste un articolo indeterminativo al plurale: in quel caso si omette "
             "l’articolo o si usa un quantificatore. Ad esempio: der Gabelstapler – "
             "ein Gabelstapler; die Palette – eine Palette【756518071371949†L116-L123】."),
-        questions=[
+        questions=(
             GrammarQuestion(
                 prompt="Quale articolo indeterminativo (ein/eine) usi con ‘Gabelstapler’ (carrello elevatore)?",
-                options=["ein", "eine", "(nessuno)"],
+                options=("ein", "eine", "(nessuno)"),
                 answer="ein",
                 explanation="Gabelstapler è maschile, quindi si usa 'ein'.",
             ),
             GrammarQuestion(
                 prompt="Quale articolo indeterminativo usi con ‘Palette’ (pallet)?",
-                options=["ein", "eine", "(nessuno)"],
+                options=("ein", "eine", "(nessuno)"),
                 answer="eine",
                 explanation="Palette è un sostantivo femminile; l’articolo indeterminativo è 'eine'.",
             ),
             GrammarQuestion(
                 prompt="Quale articolo indeterminativo usi con ‘Lager’ (magazzino)?",
-                options=["ein", "eine", "(nessuno)"],
+                options=("ein", "eine", "(nessuno)"),
                 answer="ein",
                 explanation="Lager è neutro; in nominativo singolare l’articolo indeterminativo è 'ein'.",
             ),
             GrammarQuestion(
                 prompt="Esiste un articolo indeterminativo al plurale in tedesco?",
-                options=["Sì, 'einige'", "No, non esiste", "Sì, 'ein' per tutti i generi"],
+                options=("Sì, 'einige'", "No, non esiste", "Sì, 'ein' per tutti i generi"),
                 answer="No, non esiste",
                 explanation="In tedesco non esiste un vero e proprio articolo indeterminativo al plurale; si usano altre parole come 'einige' (alcuni)【756518071371949†L116-L123】.",
             ),
-        ],
-    )
-)
-
-# Livello 3 – Verbo sein al presente
-GRAMMAR_TOPICS.append(
+        ),
+    ),
+    # Livello 3 – Verbo sein al presente
     GrammarTopic(
         level=3,
         name="Verbo sein – presente indicativo",
@@ -197,41 +223,88 @@ GRAMMAR_TOPICS.append(
             "presente indicativo si coniuga così: ich bin (io sono), du bist (tu sei), "
             "er/sie/es ist (egli/ella/esso è), wir sind (noi siamo), ihr seid (voi siete), "
             "sie sind (essi sono), Sie sind (Lei è)【583649228292794†L158-L174】."),
-        questions=[
+        questions=(
             GrammarQuestion(
                 prompt="Completa: ich ___ (essere)",
-                options=["bin", "bist", "ist"],
+                options=("bin", "bist", "ist"),
                 answer="bin",
                 explanation="La forma per la prima persona singolare è 'ich bin'【583649228292794†L158-L174】.",
             ),
             GrammarQuestion(
                 prompt="Completa: wir ___ (essere)",
-                options=["ist", "sind", "seid"],
+                options=("ist", "sind", "seid"),
                 answer="sind",
                 explanation="Per la prima persona plurale si usa 'wir sind'【583649228292794†L158-L174】.",
             ),
             GrammarQuestion(
                 prompt="Completa: du ___ (essere)",
-                options=["bist", "bin", "seid"],
+                options=("bist", "bin", "seid"),
                 answer="bist",
                 explanation="La seconda persona singolare è 'du bist'【583649228292794†L158-L174】.",
             ),
             GrammarQuestion(
                 prompt="Completa: ihr ___ (essere)",
-                options=["seid", "sind", "ist"],
+                options=("seid", "sind", "ist"),
                 answer="seid",
                 explanation="Per la seconda persona plurale si usa 'ihr seid'【583649228292794†L158-L174】.",
             ),
-        ],
-    )
+        ),
+    ),
 )
 
 
-def get_vocabulary_by_level(level: int) -> List[VocabularyItem]:
-    """Restituisce la lista dei vocaboli per un dato livello."""
-    return [item for item in VOCABULARY if item.level == level]
+# Indici per livello costruiti una sola volta all'importazione: i dati sono
+# statici, quindi le funzioni di accesso si riducono a una ricerca nel dizionario.
+def _index_by_level(items) -> Dict[int, tuple]:
+    index: Dict[int, list] = {}
+    for item in items:
+        index.setdefault(item.level, []).append(item)
+    return {level: tuple(group) for level, group in index.items()}
+
+
+_VOCAB_BY_LEVEL: Dict[int, Tuple[VocabularyItem, ...]] = _index_by_level(VOCABULARY)
+_GRAMMAR_BY_LEVEL: Dict[int, Tuple[GrammarTopic, ...]] = _index_by_level(GRAMMAR_TOPICS)
+
+# Per ogni livello: forme "articolo singolare" e "die plurale" già formattate,
+# usate come opzioni (e distrattori) nelle domande di vocabolario.  Le tuple
+# seguono l'ordine di get_vocabulary_by_level, quindi l'i-esima voce
+# corrisponde all'i-esimo vocabolo del livello.
+LEVEL_VOCAB_STRINGS: Dict[int, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    level: (
+        tuple(f"{item.article} {item.singular}" for item in items),
+        tuple(f"die {item.plural}" for item in items),
+    )
+    for level, items in _VOCAB_BY_LEVEL.items()
+}
+
+# Domande di grammatica già nel formato usato dal gioco, per livello.  I
+# dizionari sono condivisi tra le partite e non vanno modificati.
+_GRAMMAR_QUESTION_DICTS: Dict[int, Tuple[Dict[str, Any], ...]] = {
+    level: tuple(
+        {
+            "prompt": q.prompt,
+            "options": q.options,
+            "answer": q.answer,
+            "answer_idx": q.options.index(q.answer),
+            "explanation": q.display_explanation,
+        }
+        for topic in topics
+        for q in topic.questions
+    )
+    for level, topics in _GRAMMAR_BY_LEVEL.items()
+}
+
+
+def get_vocabulary_by_level(level: int) -> Tuple[VocabularyItem, ...]:
+    """Restituisce i vocaboli di un dato livello."""
+    return _VOCAB_BY_LEVEL.get(level, ())
+
+
+def get_grammar_by_level(level: int) -> Tuple[GrammarTopic, ...]:
+    """Restituisce gli argomenti grammaticali di un dato livello."""
+    return _GRAMMAR_BY_LEVEL.get(level, ())
 
 
-def get_grammar_by_level(level: int) -> List[GrammarTopic]:
-    """Restituisce la lista degli argomenti grammaticali per un dato livello."""
-    return [topic for topic in GRAMMAR_TOPICS if topic.level == level]
+def get_grammar_questions_by_level(level: int) -> Tuple[Dict[str, Any], ...]:
+    """Restituisce le domande di grammatica di un dato livello, pronte per il gioco."""
+    return _GRAMMAR_QUESTION_DICTS.get(level, ())
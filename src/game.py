@@ -13,50 +13,90 @@ Per avviare il gioco eseguire:
 python3 game.py
 ```
 
-Il gioco richiede solo la libreria standard di Python.
+Il gioco richiede solo la libreria standard di Python.  Se è installato
+``orjson`` viene usato per leggere e scrivere il progresso più velocemente.
 """
 
-import json
 import os
+import sys
 import random
-import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Collection, Optional, Sequence
 
 from data import (
     VocabularyItem,
-    GrammarTopic,
     get_vocabulary_by_level,
     get_grammar_by_level,
+    get_grammar_questions_by_level,
     VOCABULARY,
-    GRAMMAR_TOPICS,
+    MAX_LEVEL,
+    LEVEL_VOCAB_STRINGS,
 )
 
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    _loads = orjson.loads
+except ImportError:
+    # orjson è facoltativo: in sua assenza si usa il modulo json standard
+    import json
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    _loads = json.loads
+
 PROGRESS_FILE = os.path.join(os.path.dirname(__file__), "progress.json")
 
+# Contenuto attuale di PROGRESS_FILE (letto o scritto l'ultima volta), per
+# evitare di riscrivere il file quando il progresso non è cambiato.
+_last_written_bytes: Optional[bytes] = None
+
 
 def load_progress() -> Dict[str, Any]:
     """Carica il progresso dal file se esiste, altrimenti restituisce valori iniziali."""
-    if os.path.exists(PROGRESS_FILE):
-        try:
-            with open(PROGRESS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return {
+    global _last_written_bytes
+    progress: Dict[str, Any] = {
         "current_level": 1,
         "learned_words": [],
         "last_review_date": None,
         "scores": {},
     }
+    try:
+        with open(PROGRESS_FILE, "rb") as f:
+            data = f.read()
+        progress = _loads(data)
+        _last_written_bytes = data
+    except (OSError, ValueError):
+        # File assente, illeggibile o non valido: si riparte dai valori iniziali
+        pass
+    # In memoria le parole imparate sono un insieme (ricerca O(1));
+    # su disco restano una lista JSON.
+    progress["learned_words"] = set(progress.get("learned_words", []))
+    return progress
 
 
 def save_progress(progress: Dict[str, Any]) -> None:
-    """Salva il progresso su disco."""
+    """Salva il progresso su disco, solo se è cambiato.
+
+    Il file viene scritto in un file temporaneo e poi sostituito con
+    ``os.replace``, così un'interruzione non lascia mai un JSON troncato.
+    """
+    global _last_written_bytes
+    data = _dumps(dict(progress, learned_words=sorted(progress["learned_words"])))
+    if data == _last_written_bytes:
+        return
+    tmp_file = PROGRESS_FILE + ".tmp"
     try:
-        with open(PROGRESS_FILE, "w", encoding="utf-8") as f:
-            json.dump(progress, f, ensure_ascii=False, indent=2)
+        with open(tmp_file, "wb") as f:
+            f.write(data)
+        os.replace(tmp_file, PROGRESS_FILE)
     except Exception as e:
         print(f"Errore nel salvataggio del progresso: {e}")
+    else:
+        _last_written_bytes = data
 
 
 def print_menu(current_level: int):
@@ -70,88 +110,133 @@ def print_menu(current_level: int):
 def ask_choice(num_options: int) -> int:
     """Richiede all’utente di inserire un numero di opzione valido."""
     while True:
-        choice = input("Seleziona un’opzione: ")
-        if choice.isdigit():
-            idx = int(choice)
-            if 1 <= idx <= num_options:
-                return idx
+        try:
+            idx = int(input("Seleziona un’opzione: "))
+        except ValueError:
+            idx = -1
+        if 1 <= idx <= num_options:
+            return idx
         print(f"Inserisci un numero compreso tra 1 e {num_options}.")
 
 
+def _sample_distractors(pool: Sequence[str], idx: int, rng: random.Random, k: int = 2) -> List[str]:
+    """Estrae fino a ``k`` voci di ``pool`` diverse da ``pool[idx]``.
+
+    Si estraggono indici da ``range(len(pool) - 1)`` e quelli da ``idx`` in
+    poi vengono spostati di uno: così non serve copiare ``pool`` senza la
+    risposta corretta per ogni domanda.
+    """
+    n = len(pool) - 1
+    return [pool[j + (j >= idx)] for j in rng.sample(range(n), min(k, n))]
+
+
+def _translation_question(item: VocabularyItem, pool: Sequence[str], idx: int, rng: random.Random) -> Dict[str, Any]:
+    """Domanda di traduzione: il termine tedesco (con articolo) per la parola italiana.
+
+    ``pool`` contiene le forme "articolo singolare" già formattate, nello stesso
+    ordine dei vocaboli; ``pool[idx]`` è la risposta di ``item`` e le altre voci
+    sono i distrattori, estratti con il generatore ``rng``.
+    """
+    correct_option = pool[idx]
+    opts = [correct_option] + _sample_distractors(pool, idx, rng)
+    rng.shuffle(opts)
+    return {
+        "prompt": f"Scegli il termine tedesco corretto per '{item.translation}':",
+        "options": opts,
+        "answer": correct_option,
+        "answer_idx": opts.index(correct_option),
+        "explanation": item.display_explanation,
+    }
+
+
+def _plural_question(item: VocabularyItem, pool: Sequence[str], idx: int, rng: random.Random) -> Dict[str, Any]:
+    """Domanda sul plurale di un vocabolo.
+
+    ``pool`` contiene le forme "die plurale" già formattate, nello stesso ordine
+    dei vocaboli; ``pool[idx]`` è la risposta di ``item`` e le altre voci sono i
+    distrattori, estratti con il generatore ``rng``.
+    """
+    correct_plural = pool[idx]
+    opts = [correct_plural] + _sample_distractors(pool, idx, rng)
+    rng.shuffle(opts)
+    return {
+        "prompt": f"Qual è il plurale corretto di '{item.article} {item.singular}'?",
+        "options": opts,
+        "answer": correct_plural,
+        "answer_idx": opts.index(correct_plural),
+        "explanation": item.display_explanation,
+    }
+
+
 def generate_level_questions(level: int) -> List[Dict[str, Any]]:
     """Crea la lista delle domande per un dato livello."""
-    questions: List[Dict[str, Any]] = []
+    rng = random.Random()
     vocab_items = get_vocabulary_by_level(level)
-    grammar_topics = get_grammar_by_level(level)
-    # Vocabolario
-    for item in vocab_items:
-        # Traduzione
-        correct_option = f"{item.article} {item.singular}"
-        distractors = [f"{other.article} {other.singular}" for other in vocab_items if other.singular != item.singular]
-        random.shuffle(distractors)
-        opts = [correct_option] + distractors[:2]
-        random.shuffle(opts)
-        questions.append(
-            {
-                "prompt": f"Scegli il termine tedesco corretto per '{item.translation}':",
-                "options": opts,
-                "answer": correct_option,
-                "explanation": item.explanation,
-            }
-        )
-        # Plurale
-        correct_plural = f"die {item.plural}"
-        distract_plurals = [f"die {other.plural}" for other in vocab_items if other.singular != item.singular]
-        random.shuffle(distract_plurals)
-        opts2 = [correct_plural] + distract_plurals[:2]
-        random.shuffle(opts2)
-        questions.append(
-            {
-                "prompt": f"Qual è il plurale corretto di '{item.article} {item.singular}'?",
-                "options": opts2,
-                "answer": correct_plural,
-                "explanation": item.explanation,
-            }
-        )
-    # Grammatica
-    for topic in grammar_topics:
-        for q in topic.questions:
-            questions.append(
-                {
-                    "prompt": q.prompt,
-                    "options": q.options,
-                    "answer": q.answer,
-                    "explanation": q.explanation,
-                }
-            )
-    random.shuffle(questions)
+    singulars, plurals = LEVEL_VOCAB_STRINGS.get(level, ((), ()))
+    # Vocabolario (traduzione e plurale per ogni parola) e grammatica
+    questions: List[Dict[str, Any]] = (
+        [_translation_question(item, singulars, i, rng) for i, item in enumerate(vocab_items)]
+        + [_plural_question(item, plurals, i, rng) for i, item in enumerate(vocab_items)]
+        + list(get_grammar_questions_by_level(level))
+    )
+    rng.shuffle(questions)
+    return questions
+
+
+def generate_review_questions(learned: Collection[str], current_level: int) -> List[Dict[str, Any]]:
+    """Crea le domande del ripasso: vocaboli già imparati e grammatica sbloccata.
+
+    Per ogni vocabolo in ``learned`` viene scelta a caso una domanda di
+    traduzione o di plurale; la grammatica comprende i livelli fino a
+    ``current_level`` incluso.
+    """
+    rng = random.Random()
+    vocab_items = [item for item in VOCABULARY if item.singular in learned]
+    questions: List[Dict[str, Any]] = []
+    singulars = [f"{item.article} {item.singular}" for item in vocab_items]
+    plurals = [f"die {item.plural}" for item in vocab_items]
+    # Domande vocabolario
+    # Un bit casuale per vocabolo, estratti tutti insieme: 1 = traduzione, 0 = plurale.
+    # (getrandbits(0) è accettato solo da Python 3.9.)
+    kinds = rng.getrandbits(len(vocab_items)) if vocab_items else 0
+    for i, item in enumerate(vocab_items):
+        if (kinds >> i) & 1:
+            questions.append(_translation_question(item, singulars, i, rng))
+        else:
+            questions.append(_plural_question(item, plurals, i, rng))
+    # Domande grammatica
+    for grammar_level in range(1, current_level + 1):
+        questions.extend(get_grammar_questions_by_level(grammar_level))
+    rng.shuffle(questions)
     return questions
 
 
 def run_questionnaire(questions: List[Dict[str, Any]]) -> int:
     """Esegue una serie di domande e restituisce il numero di risposte corrette."""
     correct = 0
+    total = len(questions)
     for idx, q in enumerate(questions, start=1):
-        print(f"\nDomanda {idx}/{len(questions)}")
-        print(q["prompt"])
-        for i, opt in enumerate(q["options"], start=1):
-            print(f"  {i}. {opt}")
+        # Una sola scrittura per domanda invece di una print per riga
+        buf = [f"\nDomanda {idx}/{total}", q["prompt"]]
+        buf += [f"  {i}. {opt}" for i, opt in enumerate(q["options"], start=1)]
+        sys.stdout.write("\n".join(buf) + "\n")
+        sys.stdout.flush()
         choice = ask_choice(len(q["options"]))
-        selected = q["options"][choice - 1]
-        if selected == q["answer"]:
+        if choice - 1 == q["answer_idx"]:
             correct += 1
-            print("✔️  Corretto!")
+            verdict = "✔️  Corretto!"
         else:
-            print(f"❌  Sbagliato. La risposta corretta era: {q['answer']}")
+            verdict = f"❌  Sbagliato. La risposta corretta era: {q['answer']}"
         # Mostra spiegazione
-        print(f"Spiegazione: {q['explanation']}")
+        sys.stdout.write(f"{verdict}\nSpiegazione: {q['explanation']}\n")
     return correct
 
 
 def start_level(progress: Dict[str, Any]):
     level = progress.get("current_level", 1)
-    max_level = max(item.level for item in VOCABULARY)
-    if level > max_level:
+    scores = progress["scores"]
+    learned = progress["learned_words"]
+    if level > MAX_LEVEL:
         print("\nHai completato tutti i livelli disponibili! Usa la modalità di ripasso per continuare a esercitarti.")
         return
     print(f"\n*** Inizio del livello {level} ***")
@@ -165,29 +250,31 @@ def start_level(progress: Dict[str, Any]):
     grammar_topics = get_grammar_by_level(level)
     for topic in grammar_topics:
         print(f"\nRegola: {topic.name}")
-        print(topic.explanation)
+        print(topic.display_explanation)
     input("\nPremi INVIO per iniziare gli esercizi...")
     questions = generate_level_questions(level)
     correct = run_questionnaire(questions)
-    score_percent = int((correct / len(questions)) * 100) if questions else 0
+    total = len(questions)
+    score_percent = 100 * correct // total if total else 0
     print(f"\nHai risposto correttamente al {score_percent}% delle domande.")
-    progress["scores"][str(level)] = score_percent
-    if correct / len(questions) >= 0.8:
+    scores[str(level)] = score_percent
+    # Soglia dell'80% (correct / total >= 4/5) in aritmetica intera
+    if 5 * correct >= 4 * total:
         print("Complimenti! Hai superato il livello.")
         # Aggiungi i vocaboli alle parole imparate
-        for item in vocab_items:
-            if item.singular not in progress["learned_words"]:
-                progress["learned_words"].append(item.singular)
-        # Avanza al livello successivo se non già oltre
-        if progress["current_level"] == level:
-            progress["current_level"] += 1
+        learned.update(item.singular for item in vocab_items)
+        # Avanza al livello successivo (level è il livello attuale)
+        progress["current_level"] = level + 1
     else:
         print("Non hai raggiunto l'80% di risposte corrette. Prova di nuovo il livello per superarlo.")
     save_progress(progress)
 
 
 def daily_review(progress: Dict[str, Any]):
-    learned = progress.get("learned_words", [])
+    # Importato qui: datetime serve solo al ripasso
+    import datetime
+
+    learned = progress["learned_words"]
     if not learned:
         print("\nNon hai ancora vocaboli da ripassare. Completa prima almeno un livello.")
         return
@@ -198,58 +285,11 @@ def daily_review(progress: Dict[str, Any]):
         ans = input("\nHai già eseguito il ripasso oggi. Vuoi ripassare di nuovo? (s/n): ")
         if ans.strip().lower() != "s":
             return
-    # Costruisci domande miste dai vocaboli e dalla grammatica già sbloccata
-    max_level_done = progress.get("current_level", 1) - 1
-    vocab_items = [item for item in VOCABULARY if item.singular in learned]
-    grammar_topics: List[GrammarTopic] = [topic for topic in GRAMMAR_TOPICS if topic.level <= progress.get("current_level", 1)]
-    questions: List[Dict[str, Any]] = []
-    # Domande vocabolario
-    for item in vocab_items:
-        if random.choice([True, False]):
-            # Traduzione
-            correct_option = f"{item.article} {item.singular}"
-            distractors = [f"{other.article} {other.singular}" for other in vocab_items if other.singular != item.singular]
-            random.shuffle(distractors)
-            opts = [correct_option] + distractors[:2]
-            random.shuffle(opts)
-            questions.append(
-                {
-                    "prompt": f"Scegli il termine tedesco corretto per '{item.translation}':",
-                    "options": opts,
-                    "answer": correct_option,
-                    "explanation": item.explanation,
-                }
-            )
-        else:
-            # Plurale
-            correct_plural = f"die {item.plural}"
-            distract_plurals = [f"die {other.plural}" for other in vocab_items if other.singular != item.singular]
-            random.shuffle(distract_plurals)
-            opts2 = [correct_plural] + distract_plurals[:2]
-            random.shuffle(opts2)
-            questions.append(
-                {
-                    "prompt": f"Qual è il plurale corretto di '{item.article} {item.singular}'?",
-                    "options": opts2,
-                    "answer": correct_plural,
-                    "explanation": item.explanation,
-                }
-            )
-    # Domande grammatica
-    for topic in grammar_topics:
-        for q in topic.questions:
-            questions.append(
-                {
-                    "prompt": q.prompt,
-                    "options": q.options,
-                    "answer": q.answer,
-                    "explanation": q.explanation,
-                }
-            )
-    random.shuffle(questions)
+    questions = generate_review_questions(learned, progress.get("current_level", 1))
     print("\n*** Ripasso ***")
     correct = run_questionnaire(questions)
-    score_percent = int((correct / len(questions)) * 100) if questions else 0
+    total = len(questions)
+    score_percent = 100 * correct // total if total else 0
     print(f"\nRipasso completato: {score_percent}% di risposte corrette.")
     # Aggiorna data
     progress["last_review_date"] = today
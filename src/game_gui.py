@@ -21,83 +21,103 @@ uscirà con un messaggio di errore.
 
 """
 
-import sys
 import os
-import json
-import random
+import sys
 import datetime
-from typing import List, Dict, Any, Tuple
-# Import pygame at the module level so it is available throughout the file.
-# Some helper classes (e.g. Button) refer to ``pygame`` directly.  Without
-# a module‑level import, ``pygame`` would be undefined outside of functions
-# that import it locally (see issue #1).  We still call ``check_dependencies``
-# in ``DeutschlandGUI`` to validate that the required libraries are
-# installed and to provide a clear error message if they are missing.
+import functools
+import hashlib
+import itertools
+import queue
+import threading
+from typing import Callable, List, Dict, Any, Set, Tuple
+# Dipendenze verificate una sola volta, all'importazione del modulo: se
+# manca pygame o pyttsx3 il programma esce subito con un messaggio chiaro.
 try:
-    import pygame  # noqa: F401
-except Exception:
-    # Defer the import error until check_dependencies() is called.
-    pygame = None  # type: ignore[assignment]
+    import pygame
+    import pyttsx3
+except ImportError as e:
+    raise SystemExit(
+        f"Errore: la libreria {e.name} non è installata. Installa con 'pip install {e.name}'."
+    ) from e
 
 
 # Importa le strutture dati dal modulo esistente
 from data import (
-    VocabularyItem,
-    GrammarTopic,
     get_vocabulary_by_level,
-    get_grammar_by_level,
-    VOCABULARY,
-    GRAMMAR_TOPICS,
+    MAX_LEVEL,
+)
+# Domande e salvataggio del progresso sono condivisi con la versione CLI
+from game import (
+    generate_level_questions,
+    generate_review_questions,
+    load_progress,
+    save_progress,
 )
 
 
-
-def check_dependencies() -> None:
-    """Verifica che pygame e pyttsx3 siano installati; esce con errore in caso contrario."""
-    try:
-        import pygame  # noqa: F401
-    except ImportError as e:
-        print("Errore: la libreria pygame non è installata. Installa con 'pip install pygame'.")
-        raise e
-    try:
-        import pyttsx3  # noqa: F401
-    except ImportError as e:
-        print("Errore: la libreria pyttsx3 non è installata. Installa con 'pip install pyttsx3'.")
-        raise e
-
-
-
-def speak(text: str) -> None:
-    """Riproduce audio tramite pyttsx3. Se il motore non è disponibile, stampa il testo."""
+def _init_tts_engine():
+    """Crea il motore pyttsx3; restituisce None se la sintesi vocale non è disponibile."""
     try:
-        import pyttsx3
         engine = pyttsx3.init()
         engine.setProperty('rate', 150)
-        engine.say(text)
-        engine.runAndWait()
+        return engine
     except Exception:
-        # Fallback: stampa invece di pronunciare
-        print(f"[PRONUNCIA] {text}")
+        return None
 
 
-class Button:
-    """Classe semplice per rappresentare un pulsante in pygame."""
+# Pronunce già sintetizzate, un file WAV per testo
+_TTS_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".tts_cache")
 
-    def __init__(self, rect: Tuple[int, int, int, int], text: str, callback):
-        self.rect = pygame.Rect(rect)
-        self.text = text
-        self.callback = callback
 
-    def draw(self, surface, font, color_bg=(200, 200, 200), color_text=(0, 0, 0)):
-        pygame.draw.rect(surface, color_bg, self.rect)
-        label = font.render(self.text, True, color_text)
-        label_rect = label.get_rect(center=self.rect.center)
-        surface.blit(label, label_rect)
+def _tts_cache_path(text: str) -> str:
+    """Percorso del file WAV con la pronuncia di ``text``."""
+    return os.path.join(_TTS_CACHE_DIR, hashlib.sha1(text.encode("utf-8")).hexdigest() + ".wav")
 
-    def handle_event(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            if self.rect.collidepoint(event.pos):
-                self.callback()
+
+def _render_tts_to_cache(engine, text: str, path: str) -> None:
+    """Sintetizza ``text`` in ``path``; il file compare solo se completo."""
+    tmp_path = path[:-4] + ".tmp.wav"
+    try:
+        engine.save_to_file(text, tmp_path)
+        engine.runAndWait()
+        os.replace(tmp_path, path)
+    except Exception:
+        # Nessun file parziale lasciato nella cache
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+@functools.lru_cache(maxsize=512)
+def wrap_text(text: str, max_width: int, font) -> Tuple[str, ...]:
+    """Divide il testo in righe che non superano la larghezza indicata.
+
+    Il risultato dipende solo dagli argomenti (il font è confrontato per
+    identità), quindi viene memorizzato.  Ogni parola e lo spazio vengono
+    misurati una sola volta con ``font.size``; la suddivisione in righe
+    somma poi le larghezze intere invece di misurare di nuovo la riga
+    che cresce.
+    """
+    words = text.split()
+    widths = [font.size(word)[0] for word in words]
+    space_width = font.size(" ")[0]
+    lines: List[str] = []
+    current: List[str] = []
+    current_width = 0
+    for word, width in zip(words, widths):
+        test_width = current_width + space_width + width if current else width
+        if not current or test_width <= max_width:
+            current.append(word)
+            current_width = test_width
+        else:
+            lines.append(" ".join(current))
+            current = [word]
+            current_width = width
+    if current:
+        lines.append(" ".join(current))
+    return tuple(lines)
 
 
 class DeutschlandGUI:
@@ -107,107 +127,208 @@ class DeutschlandGUI:
     HEIGHT = 600
 
     def __init__(self):
-        check_dependencies()
-        import pygame  # import locale dopo verifica
         pygame.init()
         pygame.display.set_caption("Deutschland – Impara il tedesco")
         self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont(None, 28)
         self.large_font = pygame.font.SysFont(None, 36)
-        # caricamento/salvataggio
-        self.progress_file = os.path.join(os.path.dirname(__file__), "progress.json")
-        self.progress: Dict[str, Any] = self.load_progress()
+        self._audio_surf = self.font.render("🔊", True, (0, 0, 0))
+        # Il gioco usa solo la chiusura della finestra, il clic del mouse e
+        # le notifiche di finestra da ridisegnare (contenuto perso, ad esempio
+        # dopo essere stata coperta o ridotta a icona): tutti gli altri eventi
+        # (movimento del mouse, tastiera, ...) vengono scartati da SDL senza
+        # creare oggetti Python.
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([
+            pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE,
+        ])
+        # caricamento/salvataggio: stesso file e stesso formato della versione CLI
+        self.progress: Dict[str, Any] = load_progress()
+        # Livello attuale, letto una volta qui e aggiornato solo quando avanza
+        self._current_level: int = self.progress.get("current_level", 1)
         self.questions: List[Dict[str, Any]] = []
+        # Per ogni domanda: righe del testo e opzioni già disegnate (vedi reset_questions)
+        self._question_surfs: List[Tuple[List[Any], List[Any]]] = []
         self.current_question_index: int = 0
         self.correct_count: int = 0
         self.state: str = "menu"  # stati: menu, level, review, result
-        self.buttons: List[Button] = []
-
-    def load_progress(self) -> Dict[str, Any]:
-        if os.path.exists(self.progress_file):
+        self._result_surf: Any = None  # messaggio finale, creato da _finish_questions
+        # La finestra va ridisegnata solo quando cambia ciò che mostra: il
+        # flag viene alzato da chi cambia stato o domanda e abbassato da run.
+        self._dirty: bool = True
+        # Pulsanti a schermo, memorizzati come liste parallele (una voce per
+        # pulsante): rettangolo, etichetta già disegnata, colore di sfondo e
+        # funzione da chiamare al clic.
+        self._btn_rects: List[Any] = []
+        self._btn_labels: List[Any] = []
+        self._btn_bg: List[Tuple[int, int, int]] = []
+        self._btn_callbacks: List[Callable[[], None]] = []
+        # Sintesi vocale in un thread dedicato: il ciclo di pygame accoda
+        # soltanto i testi da pronunciare e non resta mai bloccato.
+        # Le voci in coda sono (priorità, progressivo, testo, da_riprodurre):
+        # le richieste del giocatore (priorità 0) passano davanti alle
+        # pronunce preparate in anticipo per le opzioni (priorità 1).
+        self._tts_queue: "queue.PriorityQueue[Tuple[int, int, str, bool]]" = queue.PriorityQueue()
+        self._tts_seq = itertools.count()
+        # Testi chiesti dal giocatore e non ancora pronunciati
+        self._tts_pending: Set[str] = set()
+        # Le pronunce salvate in WAV si riproducono con pygame.mixer, se
+        # disponibile; altrimenti il testo viene pronunciato direttamente.
+        # Il thread della sintesi vocale disattiva la cache al primo errore,
+        # così non ripete sintesi destinate a fallire.
+        self._tts_cache_ok: bool = pygame.mixer.get_init() is not None
+        self._sounds: Dict[str, Any] = {}
+        threading.Thread(target=self._tts_worker, daemon=True).start()
+
+    def speak(self, text: str) -> None:
+        """Pronuncia il testo senza bloccare la finestra.
+
+        Se la pronuncia è già nella cache viene riprodotta subito;
+        altrimenti viene accodata al thread della sintesi vocale.
+        """
+        sound = self._sounds.get(text)
+        if sound is None and self._tts_cache_ok:
+            path = _tts_cache_path(text)
+            if os.path.exists(path):
+                try:
+                    sound = self._sounds[text] = pygame.mixer.Sound(path)
+                except pygame.error:
+                    # File non leggibile: lo si elimina invece di riprovare
+                    # a caricarlo a ogni pressione
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+        if sound is not None:
+            sound.play()
+            return
+        # Se il giocatore preme più volte 🔊 sulla stessa parola prima che
+        # venga pronunciata, non accumula ripetizioni in coda.
+        if text in self._tts_pending:
+            return
+        self._tts_pending.add(text)
+        self._tts_queue.put_nowait((0, next(self._tts_seq), text, True))
+
+    def _tts_worker(self) -> None:
+        """Sintetizza i testi accodati con un unico motore pyttsx3.
+
+        Il motore viene creato in questo thread e usato solo qui.  Con il
+        mixer disponibile ogni testo viene salvato una volta in
+        ``.tts_cache`` e poi riprodotto dal file; al primo errore della
+        cache i testi vengono pronunciati direttamente.  Se la sintesi
+        vocale non è disponibile, il testo viene stampato.
+        """
+        engine = _init_tts_engine()
+        if self._tts_cache_ok:
+            try:
+                os.makedirs(_TTS_CACHE_DIR, exist_ok=True)
+            except OSError:
+                self._tts_cache_ok = False
+        while True:
+            _, _, text, play = self._tts_queue.get()
             try:
-                with open(self.progress_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                self._tts_process(engine, text, play)
+            finally:
+                if play:
+                    self._tts_pending.discard(text)
+
+    def _tts_process(self, engine, text: str, play: bool) -> None:
+        """Prepara nella cache e, se ``play``, pronuncia una voce della coda."""
+        if engine is None:
+            # Fallback: stampa invece di pronunciare
+            if play:
+                print(f"[PRONUNCIA] {text}")
+            return
+        if self._tts_cache_ok:
+            path = _tts_cache_path(text)
+            try:
+                if not os.path.exists(path):
+                    _render_tts_to_cache(engine, text, path)
+                    # Un file appena creato viene caricato subito: se il
+                    # motore produce file illeggibili lo si scopre qui
+                    sound = pygame.mixer.Sound(path)
+                elif play:
+                    sound = pygame.mixer.Sound(path)
+                if play:
+                    sound.play()
+                return
             except Exception:
-                pass
-        return {
-            "current_level": 1,
-            "learned_words": [],
-            "last_review_date": None,
-            "scores": {},
-        }
-
-    def save_progress(self) -> None:
-        try:
-            with open(self.progress_file, "w", encoding="utf-8") as f:
-                json.dump(self.progress, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Errore nel salvataggio del progresso: {e}")
+                # Cache non utilizzabile con questo motore: la si disattiva,
+                # si elimina l'eventuale file illeggibile e si passa alla
+                # pronuncia diretta
+                self._tts_cache_ok = False
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        if play:
+            try:
+                engine.say(text)
+                engine.runAndWait()
+            except Exception:
+                print(f"[PRONUNCIA] {text}")
 
     def reset_questions(self, level: int, review: bool = False) -> None:
         """Prepara le domande per un livello o ripasso."""
         if review:
             # Domande miste dai vocaboli imparati e dalla grammatica sbloccata
-            learned = self.progress.get("learned_words", [])
-            vocab_items = [item for item in VOCABULARY if item.singular in learned]
-            grammar_topics = [topic for topic in GRAMMAR_TOPICS if topic.level <= self.progress.get("current_level", 1)]
-            questions: List[Dict[str, Any]] = []
-            for item in vocab_items:
-                if random.choice([True, False]):
-                    correct_option = f"{item.article} {item.singular}"
-                    distractors = [f"{other.article} {other.singular}" for other in vocab_items if other.singular != item.singular]
-                    random.shuffle(distractors)
-                    opts = [correct_option] + distractors[:2]
-                    random.shuffle(opts)
-                    questions.append(
-                        {
-                            "prompt": f"Scegli il termine tedesco corretto per '{item.translation}':",
-                            "options": opts,
-                            "answer": correct_option,
-                            "explanation": item.explanation,
-                        }
-                    )
-                else:
-                    correct_plural = f"die {item.plural}"
-                    distract_plurals = [f"die {other.plural}" for other in vocab_items if other.singular != item.singular]
-                    random.shuffle(distract_plurals)
-                    opts2 = [correct_plural] + distract_plurals[:2]
-                    random.shuffle(opts2)
-                    questions.append(
-                        {
-                            "prompt": f"Qual è il plurale corretto di '{item.article} {item.singular}'?",
-                            "options": opts2,
-                            "answer": correct_plural,
-                            "explanation": item.explanation,
-                        }
-                    )
-            for topic in grammar_topics:
-                for q in topic.questions:
-                    questions.append(
-                        {
-                            "prompt": q.prompt,
-                            "options": q.options,
-                            "answer": q.answer,
-                            "explanation": q.explanation,
-                        }
-                    )
-            random.shuffle(questions)
-            self.questions = questions
+            self.questions = generate_review_questions(
+                self.progress["learned_words"], self._current_level
+            )
         else:
             self.questions = generate_level_questions(level)
+        # Il rendering dei caratteri è la parte più costosa del disegno:
+        # lo si fa una volta per domanda invece che a ogni ridisegno.
+        self._question_surfs = [
+            (
+                [self.font.render(line, True, (0, 0, 0))
+                 for line in wrap_text(q["prompt"], self.WIDTH - 40, self.font)],
+                [self.font.render(opt, True, (0, 0, 0)) for opt in q["options"]],
+            )
+            for q in self.questions
+        ]
         self.current_question_index = 0
         self.correct_count = 0
+        self._dirty = True
+        # Prepara in sottofondo le pronunce delle opzioni non ancora in cache
+        if self._tts_cache_ok:
+            for text in {opt for q in self.questions for opt in q["options"]}:
+                self._tts_queue.put_nowait((1, next(self._tts_seq), text, False))
+        if self.questions:
+            self._prepare_question_buttons(0)
+        else:
+            self._finish_questions()
+
+    def _clear_buttons(self) -> None:
+        self._btn_rects.clear()
+        self._btn_labels.clear()
+        self._btn_bg.clear()
+        self._btn_callbacks.clear()
+
+    def _add_button(self, rect: Tuple[int, int, int, int], label, color_bg: Tuple[int, int, int], callback) -> None:
+        """Aggiunge un pulsante; ``label`` è la superficie con il testo già disegnato."""
+        self._btn_rects.append(pygame.Rect(rect))
+        self._btn_labels.append(label)
+        self._btn_bg.append(color_bg)
+        self._btn_callbacks.append(callback)
+
+    def _draw_buttons(self) -> None:
+        # Sfondi opachi: fill è più veloce di pygame.draw.rect
+        screen = self.screen
+        for rect, label, color_bg in zip(self._btn_rects, self._btn_labels, self._btn_bg):
+            screen.fill(color_bg, rect)
+            screen.blit(label, label.get_rect(center=rect.center))
 
     def draw_menu(self) -> None:
         self.screen.fill((255, 255, 255))
         title = self.large_font.render("Deutschland – Impara il tedesco", True, (0, 0, 0))
         self.screen.blit(title, (self.WIDTH // 2 - title.get_width() // 2, 50))
-        level = self.progress.get("current_level", 1)
+        level = self._current_level
         sub = self.font.render(f"Livello attuale: {level}", True, (0, 0, 0))
         self.screen.blit(sub, (self.WIDTH // 2 - sub.get_width() // 2, 100))
         # Definisce pulsanti
-        self.buttons = []
+        self._clear_buttons()
         def start_level_cb():
             self.state = "level"
             self.reset_questions(level)
@@ -217,167 +338,139 @@ class DeutschlandGUI:
         def exit_cb():
             pygame.quit()
             sys.exit(0)
-        self.buttons.append(Button((self.WIDTH//2 - 100, 200, 200, 40), "Inizia livello", start_level_cb))
-        self.buttons.append(Button((self.WIDTH//2 - 100, 260, 200, 40), "Ripasso giornaliero", start_review_cb))
-        self.buttons.append(Button((self.WIDTH//2 - 100, 320, 200, 40), "Esci", exit_cb))
-        for btn in self.buttons:
-            btn.draw(self.screen, self.font, color_bg=(220, 220, 220))
-
-    def draw_question(self) -> None:
+        for y, text, cb in (
+            (200, "Inizia livello", start_level_cb),
+            (260, "Ripasso giornaliero", start_review_cb),
+            (320, "Esci", exit_cb),
+        ):
+            label = self.font.render(text, True, (0, 0, 0))
+            self._add_button((self.WIDTH//2 - 100, y, 200, 40), label, (220, 220, 220), cb)
+        self._draw_buttons()
+
+    def _prepare_question_buttons(self, index: int) -> None:
+        """Crea i pulsanti della domanda ``index``, una sola volta per domanda."""
+        q = self.questions[index]
+        prompt_surfs, option_surfs = self._question_surfs[index]
+        base_y = 40 + sum(label.get_height() + 2 for label in prompt_surfs) + 20
+        self._clear_buttons()
+        for idx, opt in enumerate(q["options"]):
+            y = base_y + idx*60
+            self._add_button((40, y, 500, 40), option_surfs[idx], (210, 210, 210),
+                             functools.partial(self._answer, opt, q["answer"]))
+            # Pulsante audio per l'opzione (colore diverso)
+            self._add_button((560, y, 40, 40), self._audio_surf, (230, 230, 250),
+                             functools.partial(self.speak, opt))
+
+    def _answer(self, opt: str, answer: str) -> None:
+        """Registra la scelta del giocatore e passa alla domanda successiva."""
+        if opt == answer:
+            self.correct_count += 1
+        # parlato: pronuncia l'opzione scelta per rinforzo
+        self.speak(opt)
+        self.current_question_index += 1
+        self._dirty = True
+        if self.current_question_index < len(self.questions):
+            self._prepare_question_buttons(self.current_question_index)
+        else:
+            self._finish_questions()
+
+    def _finish_questions(self) -> None:
+        """Calcola il risultato, aggiorna e salva i progressi (una volta sola)."""
+        correct = self.correct_count
+        total = len(self.questions)
+        # Stesso calcolo intero della versione CLI (start_level)
+        percent = 100 * correct // total if total else 0
+        msg = f"Hai risposto correttamente al {percent}% delle domande."
+        self._result_surf = self.large_font.render(msg, True, (0, 0, 0))
+        # Aggiorna progresso se livello
+        if self.state == "level":
+            level = self._current_level
+            self.progress["scores"][str(level)] = percent
+            # Soglia dell'80% (correct / total >= 4/5) in aritmetica intera
+            if 5 * correct >= 4 * total:
+                # Avanza livello
+                # aggiorna parole imparate
+                self.progress["learned_words"].update(
+                    item.singular for item in get_vocabulary_by_level(level)
+                )
+                if level < MAX_LEVEL:
+                    self.progress["current_level"] = self._current_level = level + 1
+            save_progress(self.progress)
+        elif self.state == "review":
+            # aggiorna data ripasso
+            today = datetime.date.today().isoformat()
+            self.progress["last_review_date"] = today
+            save_progress(self.progress)
+        # Pulsante per tornare al menu
+        self._clear_buttons()
+        label = self.font.render("Torna al menu", True, (0, 0, 0))
+        self._add_button((self.WIDTH//2 - 100, 300, 200, 40), label, (200, 230, 200), self._back_to_menu)
+
+    def _back_to_menu(self) -> None:
+        self.state = "menu"
+        self._dirty = True
+
+    def _render_question(self) -> None:
+        """Disegna la domanda corrente (o il risultato) con superfici e pulsanti già pronti."""
         self.screen.fill((255, 255, 255))
         if self.current_question_index >= len(self.questions):
             # Fine questionario
-            percent = int((self.correct_count / len(self.questions)) * 100) if self.questions else 0
-            msg = f"Hai risposto correttamente al {percent}% delle domande."
-            result = self.large_font.render(msg, True, (0, 0, 0))
+            result = self._result_surf
             self.screen.blit(result, (self.WIDTH//2 - result.get_width()//2, 200))
-            # Aggiorna progresso se livello
-            if self.state == "level":
-                level = self.progress.get("current_level", 1)
-                self.progress["scores"][str(level)] = percent
-                if self.correct_count / len(self.questions) >= 0.8:
-                    # Avanza livello
-                    # aggiorna parole imparate
-                    for item in get_vocabulary_by_level(level):
-                        if item.singular not in self.progress["learned_words"]:
-                            self.progress["learned_words"].append(item.singular)
-                    max_level = max(item.level for item in VOCABULARY)
-                    if level < max_level:
-                        self.progress["current_level"] = level + 1
-                self.save_progress()
-            elif self.state == "review":
-                # aggiorna data ripasso
-                today = datetime.date.today().isoformat()
-                self.progress["last_review_date"] = today
-                self.save_progress()
-            # Pulsante per tornare al menu
-            def back_cb():
-                self.state = "menu"
-            self.buttons = [Button((self.WIDTH//2 - 100, 300, 200, 40), "Torna al menu", back_cb)]
-            for btn in self.buttons:
-                btn.draw(self.screen, self.font, color_bg=(200, 230, 200))
-            return
-        # Mostra domanda corrente
-        q = self.questions[self.current_question_index]
-        prompt_lines = self.wrap_text(q["prompt"], self.WIDTH - 40, self.font)
-        y = 40
-        for line in prompt_lines:
-            label = self.font.render(line, True, (0, 0, 0))
-            self.screen.blit(label, (20, y))
-            y += label.get_height() + 2
-        # Mostra opzioni come pulsanti
-        self.buttons = []
-        base_y = y + 20
-        for idx, opt in enumerate(q["options"]):
-            def make_callback(opt=opt):
-                def cb():
-                    # registra scelta, controlla correttezza e mostra spiegazione
-                    is_correct = opt == q["answer"]
-                    if is_correct:
-                        self.correct_count += 1
-                    # parlato: pronuncia l'opzione scelta per rinforzo
-                    speak(opt)
-                    # mostra spiegazione breve in console e continua
-                    # nella GUI potremmo mostrare un messaggio temporaneo
-                    self.current_question_index += 1
-                return cb
-            btn = Button((40, base_y + idx*60, 500, 40), opt, make_callback())
-            self.buttons.append(btn)
-            # Pulsante audio per l'opzione
-            def audio_cb(word=opt):
-                return lambda: speak(word)
-            audio_button = Button((560, base_y + idx*60, 40, 40), "🔊", audio_cb(opt))
-            self.buttons.append(audio_button)
-        # Non disegna spiegazione qui; spiegazione sarà stampata in console
-        for btn in self.buttons:
-            # colore diverso per audio
-            if btn.text == "🔊":
-                btn.draw(self.screen, self.font, color_bg=(230, 230, 250))
-            else:
-                btn.draw(self.screen, self.font, color_bg=(210, 210, 210))
-
-    def wrap_text(self, text: str, max_width: int, font) -> List[str]:
-        """Divide il testo in righe che non superano la larghezza indicata."""
-        words = text.split()
-        lines: List[str] = []
-        current = ""
-        for word in words:
-            test = f"{current} {word}" if current else word
-            if font.size(test)[0] <= max_width:
-                current = test
-            else:
-                lines.append(current)
-                current = word
-        if current:
-            lines.append(current)
-        return lines
+        else:
+            # Mostra domanda corrente
+            y = 40
+            for label in self._question_surfs[self.current_question_index][0]:
+                self.screen.blit(label, (20, y))
+                y += label.get_height() + 2
+        # Opzioni (con pulsante audio) oppure "Torna al menu"
+        self._draw_buttons()
 
     def run(self) -> None:
-        import pygame  # reinizializza alias
+        # Funzioni usate a ogni fotogramma legate a variabili locali
+        pump = pygame.event.pump
+        get_events = pygame.event.get
+        flip = pygame.display.flip
+        tick = self.clock.tick
+        wait = pygame.time.wait
+        make_rect = pygame.Rect
+        QUIT = pygame.QUIT
+        MOUSEBUTTONDOWN = pygame.MOUSEBUTTONDOWN
+        EXPOSED = (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE)
         running = True
         while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+            # Una sola lettura della coda eventi di SDL per fotogramma
+            pump()
+            events = get_events(pump=False)
+            for event in events:
+                if event.type == QUIT:
                     running = False
-                else:
-                    # Gestione pulsanti
-                    for btn in self.buttons:
-                        btn.handle_event(event)
-            if self.state == "menu":
-                self.draw_menu()
-            elif self.state in ("level", "review"):
-                self.draw_question()
-            pygame.display.flip()
-            self.clock.tick(30)
+                elif event.type == MOUSEBUTTONDOWN and event.button == 1:
+                    # Gestione pulsanti: collidelist confronta il punto con
+                    # tutti i rettangoli in C e restituisce il primo colpito
+                    hit = make_rect(event.pos, (1, 1)).collidelist(self._btn_rects)
+                    if hit != -1:
+                        self._btn_callbacks[hit]()
+                elif event.type in EXPOSED:
+                    # Il sistema ha perso il contenuto della finestra
+                    self._dirty = True
+            # Nei fotogrammi senza cambiamenti non si disegna né si aggiorna
+            # la finestra: il suo contenuto è ancora quello corretto.
+            if self._dirty:
+                if self.state == "menu":
+                    self.draw_menu()
+                elif self.state in ("level", "review"):
+                    self._render_question()
+                flip()
+                self._dirty = False
+            if events:
+                tick(30)
+            else:
+                # Nessun input: cede la CPU per la durata di un fotogramma
+                wait(1000 // 30)
         pygame.quit()
 
 
-def generate_level_questions(level: int) -> List[Dict[str, Any]]:
-    """Funzione di utilità condivisa con la versione CLI per generare domande per un livello."""
-    questions: List[Dict[str, Any]] = []
-    vocab_items = get_vocabulary_by_level(level)
-    grammar_topics = get_grammar_by_level(level)
-    for item in vocab_items:
-        correct_option = f"{item.article} {item.singular}"
-        distractors = [f"{other.article} {other.singular}" for other in vocab_items if other.singular != item.singular]
-        random.shuffle(distractors)
-        opts = [correct_option] + distractors[:2]
-        random.shuffle(opts)
-        questions.append(
-            {
-                "prompt": f"Scegli il termine tedesco corretto per '{item.translation}':",
-                "options": opts,
-                "answer": correct_option,
-                "explanation": item.explanation,
-            }
-        )
-        correct_plural = f"die {item.plural}"
-        distract_plurals = [f"die {other.plural}" for other in vocab_items if other.singular != item.singular]
-        random.shuffle(distract_plurals)
-        opts2 = [correct_plural] + distract_plurals[:2]
-        random.shuffle(opts2)
-        questions.append(
-            {
-                "prompt": f"Qual è il plurale corretto di '{item.article} {item.singular}'?",
-                "options": opts2,
-                "answer": correct_plural,
-                "explanation": item.explanation,
-            }
-        )
-    for topic in grammar_topics:
-        for q in topic.questions:
-            questions.append(
-                {
-                    "prompt": q.prompt,
-                    "options": q.options,
-                    "answer": q.answer,
-                    "explanation": q.explanation,
-                }
-            )
-    random.shuffle(questions)
-    return questions
-
-
 if __name__ == "__main__":
     gui = DeutschlandGUI()
     gui.run()